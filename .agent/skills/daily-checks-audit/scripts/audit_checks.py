@@ -10,18 +10,24 @@ Validates daily monitoring reports to ensure:
 Supports customer-specific threshold configurations via JSON config files.
 """
 
+import io
+import os
 import sys
 import re
+import copy
 import json
+import functools
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from types import ModuleType
 from typing import Any
 
-try:
-    import openpyxl
-except ImportError:
-    print("Error: openpyxl is required. Install with: pip install openpyxl")
-    sys.exit(1)
+# openpyxl is imported on first workbook load so usage/error paths start fast
+_openpyxl: ModuleType | None = None
 
 
 def detect_customer(filename: str) -> str | None:
@@ -40,15 +46,23 @@ def detect_customer(filename: str) -> str | None:
     return None
 
 
-def load_customer_config(customer: str, script_dir: Path) -> dict | None:
-    """Load customer-specific config from configs directory."""
-    config_path = script_dir.parent / 'configs' / f'{customer}_config.json'
+@functools.lru_cache(maxsize=None)
+def _load_customer_config_cached(customer: str, script_dir_str: str) -> dict | None:
+    """Read and parse a customer config file once per process."""
+    config_path = Path(script_dir_str).parent / 'configs' / f'{customer}_config.json'
     if config_path.exists():
         with open(config_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     return None
 
 
+def load_customer_config(customer: str, script_dir: Path) -> dict | None:
+    """Load customer-specific config from configs directory."""
+    config = _load_customer_config_cached(customer, str(script_dir))
+    # Hand out a copy so callers cannot mutate the cached config
+    return copy.deepcopy(config)
+
+
 def get_threshold(config: dict | None, metric: str, default: int) -> int:
     """Get threshold from config or return default."""
     if config and 'thresholds' in config:
@@ -133,18 +147,38 @@ CHECK_PATTERNS = {
     'nwa': r'NWA|system overview'
 }
 
+# All check patterns compiled into one regex. Each alternative is an anchored
+# lookahead so the first matching entry in CHECK_PATTERNS order still wins,
+# exactly as when the patterns were searched one by one. Row text is already
+# lowercased, so the patterns are lowercased here instead of using IGNORECASE.
+CHECK_PATTERNS_COMBINED = re.compile(
+    '|'.join(f'(?=(?s:.*?)(?P<{name}>{pattern.lower()}))' for name, pattern in CHECK_PATTERNS.items())
+)
+
+# Literal substrings of which at least one appears in any text matched by
+# CHECK_PATTERNS. Keep in sync when adding patterns; rows containing none of
+# them skip the regex entirely.
+CHECK_PATTERN_ANCHORS = (
+    'sm', 'st0', 'st2', 'server', 'work process', 'response time', 'system log',
+    'job', 'lock', 'dump', 'dbacockpit', 'database', 'update', 'buffer',
+    'workload', 'spad', 'spool', 'trfc', 'sost', 'email', 'cmc', 'nwa',
+    'system overview'
+)
+
+# Keywords used by the numeric threshold validators; rows matching none of
+# them cannot raise a threshold issue.
+NUMERIC_PRESCREEN = re.compile(r'resp time|dump|failed update|cpicerr|sysfail|old lock')
 
+
+@dataclass(slots=True)
 class AuditIssue:
     """Represents a single audit finding."""
-    
-    def __init__(self, sheet: str, row: int, check_type: str, 
-                 severity: str, message: str, context: str = ""):
-        self.sheet = sheet
-        self.row = row
-        self.check_type = check_type
-        self.severity = severity  # 'critical', 'warning', 'info'
-        self.message = message
-        self.context = context
+    sheet: str
+    row: int
+    check_type: str
+    severity: str  # 'critical', 'warning', 'info'
+    message: str
+    context: str = ""
     
     def __repr__(self):
         return f"[{self.severity.upper()}] {self.sheet} Row {self.row}: {self.message}"
@@ -162,57 +196,91 @@ class DailyChecksAuditor:
         self.customer = customer
         self.screenshot_stats = {'analyzed': 0, 'issues': 0}
         
+        # Config is fixed for the auditor's lifetime, so resolve thresholds once
+        self.resp_threshold = get_threshold(config, 'response_time_smlg', 1000)
+        self.dumps_today_threshold = get_threshold(config, 'dumps_today', 50)
+        self.dumps_yesterday_threshold = get_threshold(config, 'dumps_yesterday', 100)
+        
+        # Numeric threshold checks, dispatched on the current check type
+        self._numeric_validators = {
+            'smlg': self._validate_smlg,
+            'st22': self._validate_st22,
+            'sm13': self._validate_sm13,
+            'sm58': self._validate_sm58,
+            'sm12': self._validate_sm12
+        }
+        
     def load_workbook(self) -> bool:
         """Load the Excel workbook."""
+        global _openpyxl
+        if _openpyxl is None:
+            try:
+                import openpyxl
+            except ImportError:
+                print("Error: openpyxl is required. Install with: pip install openpyxl")
+                return False
+            _openpyxl = openpyxl
+        
         try:
-            self.workbook = openpyxl.load_workbook(self.excel_path, data_only=True)
+            # Read-only mode streams rows instead of building the full cell model
+            self.workbook = _openpyxl.load_workbook(
+                self.excel_path, data_only=True, read_only=True, keep_links=False
+            )
             return True
         except Exception as e:
             print(f"Error loading workbook: {e}")
             return False
     
-    def extract_metadata(self, sheet) -> dict:
-        """Extract header metadata from a sheet."""
-        metadata = {
+    def new_metadata(self) -> dict:
+        """Create an empty header metadata record."""
+        return {
             'system_name': None,
             'date': None,
             'time': None,
             'performed_by': None
         }
+    
+    def collect_metadata(self, metadata: dict, row: tuple) -> None:
+        """Record a header row (rows 1-5) into the metadata record."""
+        if row:
+            label = str(row[0]).strip().lower() if row[0] else ""
+            value = row[1] if len(row) > 1 else None
+            
+            if 'system name' in label:
+                metadata['system_name'] = value
+            elif 'date' in label:
+                metadata['date'] = value
+            elif 'time' in label:
+                metadata['time'] = value
+            elif 'performed by' in label:
+                metadata['performed_by'] = value
+    
+    def extract_metadata(self, sheet) -> dict:
+        """Extract header metadata from a sheet."""
+        metadata = self.new_metadata()
         
-        for row_idx in range(1, 6):
-            row = [cell.value for cell in sheet[row_idx]]
-            if row:
-                label = str(row[0]).strip().lower() if row[0] else ""
-                value = row[1] if len(row) > 1 else None
-                
-                if 'system name' in label:
-                    metadata['system_name'] = value
-                elif 'date' in label:
-                    metadata['date'] = value
-                elif 'time' in label:
-                    metadata['time'] = value
-                elif 'performed by' in label:
-                    metadata['performed_by'] = value
+        # Read-only worksheets do not support random row access, so stream rows 1-5
+        for row in sheet.iter_rows(max_row=5, values_only=True):
+            self.collect_metadata(metadata, row)
         
         return metadata
     
-    def identify_check_type(self, row_data: list) -> str | None:
-        """Identify the type of check based on row content."""
-        row_text = ' '.join(str(cell) for cell in row_data if cell).lower()
+    def identify_check_type(self, row_text: str) -> str | None:
+        """Identify the type of check from a row's lowercased text."""
+        # Cheap substring prescreen: most rows mention no check keyword at all
+        if not any(anchor in row_text for anchor in CHECK_PATTERN_ANCHORS):
+            return None
         
-        for check_type, pattern in CHECK_PATTERNS.items():
-            if re.search(pattern, row_text, re.IGNORECASE):
-                return check_type
-        return None
+        match = CHECK_PATTERNS_COMBINED.match(row_text)
+        return match.lastgroup if match else None
     
-    def get_cell_value(self, row: list, col_idx: int) -> Any:
+    def get_cell_value(self, row: tuple, col_idx: int) -> Any:
         """Safely get a cell value from a row."""
         if col_idx < len(row):
             return row[col_idx]
         return None
     
-    def is_negative_response(self, row: list) -> bool:
+    def is_negative_response(self, row: tuple) -> bool:
         """Check if the row contains a negative (N) response."""
         # Check columns D, E for 'N' response (0-indexed: 3, 4)
         for col_idx in [3, 4]:
@@ -221,7 +289,7 @@ class DailyChecksAuditor:
                 return True
         return False
     
-    def has_justification(self, row: list) -> tuple[bool, str]:
+    def has_justification(self, row: tuple) -> tuple[bool, str]:
         """Check if a negative response has a justification in Status column (G)."""
         status = self.get_cell_value(row, 6)  # Column G (0-indexed: 6)
         
@@ -232,56 +300,174 @@ class DailyChecksAuditor:
                 return True, status_str
         return False, ""
     
-    def extract_numeric_value(self, row: list) -> tuple[float | None, int]:
+    def _classify_status(self, row: tuple) -> tuple[bool, str]:
+        """Return (is_negative, justification) for a row in one pass.
+        
+        The justification is only looked up for negative (N) rows.
+        """
+        # Check columns D, E for 'N' response (0-indexed: 3, 4)
+        for col_idx in (3, 4):
+            val = row[col_idx] if col_idx < len(row) else None
+            if val and str(val).strip().upper() == 'N':
+                break
+        else:
+            return False, ""
+        
+        status = row[6] if len(row) > 6 else None  # Column G (0-indexed: 6)
+        if status:
+            status_str = str(status).strip()
+            if status_str and status_str not in ('\xa0', ' '):
+                return True, status_str
+        return True, ""
+    
+    def extract_numeric_value(self, row: tuple) -> tuple[float | None, int]:
         """Extract numeric value and its column index from a row."""
         # Check columns D, E, F for numeric values
-        for col_idx in [3, 4, 5]:
-            val = self.get_cell_value(row, col_idx)
-            if val is not None:
-                # Handle string numbers with formatting
-                if isinstance(val, str):
-                    # Remove thousand separators and handle decimal formats
-                    cleaned = val.replace(',', '.').replace(' ', '')
-                    try:
-                        return float(cleaned), col_idx
-                    except ValueError:
-                        continue
-                elif isinstance(val, (int, float)):
+        for col_idx in (3, 4, 5):
+            val = row[col_idx] if col_idx < len(row) else None
+            if val is None:
+                continue
+            # Numeric cells are the common case, so test them first
+            if isinstance(val, (int, float)):
+                return float(val), col_idx
+            # Handle string numbers with formatting
+            if isinstance(val, str):
+                # Remove thousand separators and handle decimal formats
+                if ',' in val or ' ' in val:
+                    val = val.replace(',', '.').replace(' ', '')
+                try:
                     return float(val), col_idx
+                except ValueError:
+                    continue
         return None, -1
     
+    def _validate_smlg(self, row: tuple, numeric_val: float, row_text: str,
+                       sheet_name: str, row_idx: int, issues: list[AuditIssue]) -> None:
+        """Response time checks (SMLG)."""
+        if 'resp time' in row_text and numeric_val > self.resp_threshold:
+            issues.append(AuditIssue(
+                sheet=sheet_name,
+                row=row_idx,
+                check_type='smlg',
+                severity='warning',
+                message=f'Response time {numeric_val}ms exceeds {self.resp_threshold}ms threshold',
+                context=str(list(row[1:4]))
+            ))
+    
+    def _validate_st22(self, row: tuple, numeric_val: float, row_text: str,
+                       sheet_name: str, row_idx: int, issues: list[AuditIssue]) -> None:
+        """Dump count checks (ST22)."""
+        if 'dump' not in row_text:
+            return
+        
+        if 'today' in row_text and numeric_val > self.dumps_today_threshold:
+            issues.append(AuditIssue(
+                sheet=sheet_name,
+                row=row_idx,
+                check_type='st22',
+                severity='warning',
+                message=f'High dump count today: {int(numeric_val)} (threshold: {self.dumps_today_threshold})',
+                context=""
+            ))
+        
+        if 'yesterday' in row_text and numeric_val > self.dumps_yesterday_threshold:
+            issues.append(AuditIssue(
+                sheet=sheet_name,
+                row=row_idx,
+                check_type='st22',
+                severity='warning',
+                message=f'High dump count yesterday: {int(numeric_val)} (threshold: {self.dumps_yesterday_threshold})',
+                context=""
+            ))
+    
+    def _validate_sm13(self, row: tuple, numeric_val: float, row_text: str,
+                       sheet_name: str, row_idx: int, issues: list[AuditIssue]) -> None:
+        """Failed update checks (SM13)."""
+        if 'failed update' in row_text and numeric_val > 0:
+            issues.append(AuditIssue(
+                sheet=sheet_name,
+                row=row_idx,
+                check_type='sm13',
+                severity='critical',
+                message=f'Failed updates detected: {int(numeric_val)}',
+                context=""
+            ))
+    
+    def _validate_sm58(self, row: tuple, numeric_val: float, row_text: str,
+                       sheet_name: str, row_idx: int, issues: list[AuditIssue]) -> None:
+        """tRFC error checks (SM58)."""
+        if ('cpicerr' in row_text or 'sysfail' in row_text) and numeric_val > 0:
+            issues.append(AuditIssue(
+                sheet=sheet_name,
+                row=row_idx,
+                check_type='sm58',
+                severity='critical',
+                message=f'tRFC errors detected: {int(numeric_val)}',
+                context=""
+            ))
+    
+    def _validate_sm12(self, row: tuple, numeric_val: float, row_text: str,
+                       sheet_name: str, row_idx: int, issues: list[AuditIssue]) -> None:
+        """Old lock checks (SM12)."""
+        if 'old lock' in row_text or 'number of old locks' in row_text:
+            if numeric_val > 0:
+                # Check if there's an explanation
+                has_just, _ = self.has_justification(row)
+                if not has_just:
+                    issues.append(AuditIssue(
+                        sheet=sheet_name,
+                        row=row_idx,
+                        check_type='sm12',
+                        severity='warning',
+                        message=f'Old locks present ({int(numeric_val)}) without explanation',
+                        context=""
+                    ))
+    
     def audit_sheet(self, sheet_name: str) -> list[AuditIssue]:
         """Audit a single sheet and return issues found."""
         sheet = self.workbook[sheet_name]
+        # Read-only iteration stops at the recorded dimension, which some
+        # writers under-report; streaming does not need it, so drop it
+        sheet.reset_dimensions()
         issues = []
         current_check_type = None
+        metadata = self.new_metadata()
         
-        self.metadata[sheet_name] = self.extract_metadata(sheet)
-        
-        for row_idx, row in enumerate(sheet.iter_rows(min_row=6, values_only=True), 6):
-            row_list = list(row)
+        # Single streaming pass: rows 1-5 are header metadata, rows 6+ are checks
+        for row_idx, row in enumerate(sheet.iter_rows(values_only=True), 1):
+            if row_idx <= 5:
+                self.collect_metadata(metadata, row)
+                continue
             
             # Skip empty rows
-            if not any(cell for cell in row_list):
+            if not any(row):
                 continue
             
+            # Lowercased text of the description columns (A-C), shared by
+            # check-type and threshold detection. Values (D-F) and status
+            # justifications (G) are left out so they cannot trigger checks.
+            row_text = ' '.join(str(row[i]) for i in (0, 1, 2) if i < len(row) and row[i]).lower()
+            
             # Identify check type from header rows
-            check_type = self.identify_check_type(row_list)
+            check_type = self.identify_check_type(row_text)
             if check_type:
                 current_check_type = check_type
             
+            # Description-only rows (nothing in D-G) have no response, value or status
+            if all(cell is None for cell in row[3:7]):
+                continue
+            
             # Check for negative responses without justification
-            if self.is_negative_response(row_list):
-                has_just, justification = self.has_justification(row_list)
-                
-                if not has_just:
+            is_negative, justification = self._classify_status(row)
+            if is_negative:
+                if not justification:
                     issues.append(AuditIssue(
                         sheet=sheet_name,
                         row=row_idx,
                         check_type=current_check_type or 'unknown',
                         severity='critical',
                         message='Negative (N) response without justification',
-                        context=str(row_list[0:4]) if row_list else ""
+                        context=str(list(row[0:4]))
                     ))
                 else:
                     # Check if justification is substantive (not just a code or short text)
@@ -292,175 +478,165 @@ class DailyChecksAuditor:
                             check_type=current_check_type or 'unknown',
                             severity='warning',
                             message=f'Negative response has brief justification: "{justification}"',
-                            context=str(row_list[0:4]) if row_list else ""
+                            context=str(list(row[0:4]))
                         ))
             
             # Check numeric thresholds based on check type
-            row_text = ' '.join(str(cell) for cell in row_list if cell).lower()
-            numeric_val, _ = self.extract_numeric_value(row_list)
+            if not NUMERIC_PRESCREEN.search(row_text):
+                continue
+            
+            numeric_val, _ = self.extract_numeric_value(row)
             
             if numeric_val is not None:
-                # Response time checks (SMLG)
-                resp_threshold = get_threshold(self.config, 'response_time_smlg', 1000)
-                if 'resp time' in row_text and numeric_val > resp_threshold:
-                    issues.append(AuditIssue(
-                        sheet=sheet_name,
-                        row=row_idx,
-                        check_type='smlg',
-                        severity='warning',
-                        message=f'Response time {numeric_val}ms exceeds {resp_threshold}ms threshold',
-                        context=str(row_list[1:4]) if row_list else ""
-                    ))
-                
-                # Dump count checks
-                dumps_today_threshold = get_threshold(self.config, 'dumps_today', 50)
-                if 'dump' in row_text and 'today' in row_text and numeric_val > dumps_today_threshold:
-                    issues.append(AuditIssue(
-                        sheet=sheet_name,
-                        row=row_idx,
-                        check_type='st22',
-                        severity='warning',
-                        message=f'High dump count today: {int(numeric_val)} (threshold: {dumps_today_threshold})',
-                        context=""
-                    ))
-                
-                dumps_yesterday_threshold = get_threshold(self.config, 'dumps_yesterday', 100)
-                if 'dump' in row_text and 'yesterday' in row_text and numeric_val > dumps_yesterday_threshold:
-                    issues.append(AuditIssue(
-                        sheet=sheet_name,
-                        row=row_idx,
-                        check_type='st22',
-                        severity='warning',
-                        message=f'High dump count yesterday: {int(numeric_val)} (threshold: {dumps_yesterday_threshold})',
-                        context=""
-                    ))
-                
-                # Failed updates
-                if 'failed update' in row_text and numeric_val > 0:
-                    issues.append(AuditIssue(
-                        sheet=sheet_name,
-                        row=row_idx,
-                        check_type='sm13',
-                        severity='critical',
-                        message=f'Failed updates detected: {int(numeric_val)}',
-                        context=""
-                    ))
-                
-                # tRFC errors
-                if ('cpicerr' in row_text or 'sysfail' in row_text) and numeric_val > 0:
-                    issues.append(AuditIssue(
-                        sheet=sheet_name,
-                        row=row_idx,
-                        check_type='sm58',
-                        severity='critical',
-                        message=f'tRFC errors detected: {int(numeric_val)}',
-                        context=""
-                    ))
-                
-                # Old locks
-                if 'old lock' in row_text or 'number of old locks' in row_text:
-                    if numeric_val > 0:
-                        # Check if there's an explanation
-                        has_just, _ = self.has_justification(row_list)
-                        if not has_just:
-                            issues.append(AuditIssue(
-                                sheet=sheet_name,
-                                row=row_idx,
-                                check_type='sm12',
-                                severity='warning',
-                                message=f'Old locks present ({int(numeric_val)}) without explanation',
-                                context=""
-                            ))
+                validator = self._numeric_validators.get(current_check_type)
+                if validator:
+                    validator(row, numeric_val, row_text, sheet_name, row_idx, issues)
+                else:
+                    # Unknown section: run every numeric check
+                    for validator in self._numeric_validators.values():
+                        validator(row, numeric_val, row_text, sheet_name, row_idx, issues)
         
+        self.metadata[sheet_name] = metadata
         return issues
     
+    def has_body_rows(self, sheet) -> bool:
+        """Check for any non-empty row below the header, ignoring the recorded dimension."""
+        sheet.reset_dimensions()
+        return any(any(row) for row in sheet.iter_rows(min_row=6, values_only=True))
+    
     def audit_all_sheets(self) -> None:
         """Audit all sheets in the workbook."""
-        for sheet_name in self.workbook.sheetnames:
-            sheet_issues = self.audit_sheet(sheet_name)
-            self.issues.extend(sheet_issues)
+        sheet_names = self.workbook.sheetnames
+        
+        # Sheets with no content past the header (rows 1-5) are empty templates:
+        # record their metadata without a full audit. The recorded dimension is
+        # only a hint; a sheet claiming to end early is checked for later rows.
+        audit_names = []
+        for sheet_name in sheet_names:
+            sheet = self.workbook[sheet_name]
+            if sheet.max_row is not None and sheet.max_row < 6 and not self.has_body_rows(sheet):
+                self.metadata[sheet_name] = self.extract_metadata(sheet)
+            else:
+                audit_names.append(sheet_name)
+        
+        cpus = _usable_cpu_count()
+        # Stay serial when the pool is not worth its startup cost, there is no
+        # spare CPU, or other threads are running (e.g. the MCP server's
+        # screenshot loop): forking a multi-threaded process can deadlock, and
+        # spawned workers cost more to start than a typical workbook takes
+        if len(audit_names) <= 2 or cpus < 2 or threading.active_count() > 1:
+            for sheet_name in audit_names:
+                sheet_issues = self.audit_sheet(sheet_name)
+                self.issues.extend(sheet_issues)
+        else:
+            # Sheets are independent: audit them in parallel, one workbook handle per worker
+            worker = functools.partial(_audit_sheet_worker, self.excel_path, config=self.config)
+            max_workers = min(len(audit_names), cpus)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for sheet_name, metadata, sheet_issues in executor.map(worker, audit_names):
+                    self.metadata[sheet_name] = metadata
+                    self.issues.extend(sheet_issues)
+        
+        # Keep metadata in workbook sheet order for the report
+        self.metadata = {sheet_name: self.metadata[sheet_name] for sheet_name in sheet_names}
+        
+        # Release the underlying zip handle held by the read-only workbook
+        self.workbook.close()
     
     def generate_report(self) -> str:
         """Generate a markdown audit report."""
-        report = []
+        buf = io.StringIO()
+        write = buf.write
+        # Workbook.sheetnames builds a new list on every access
+        sheet_names = self.workbook.sheetnames
         
         # Header
-        report.append(f"# Audit Report - {self.excel_path.name}\n")
-        report.append(f"**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        write(f"# Audit Report - {self.excel_path.name}\n\n")
+        write(f"**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        
+        # Bucket issues by sheet and severity in a single pass
+        totals = Counter()
+        by_sheet: dict[str, dict[str, list[AuditIssue]]] = defaultdict(lambda: defaultdict(list))
+        for issue in self.issues:
+            totals[issue.severity] += 1
+            by_sheet[issue.sheet][issue.severity].append(issue)
         
         # Executive Summary
-        critical_count = sum(1 for i in self.issues if i.severity == 'critical')
-        warning_count = sum(1 for i in self.issues if i.severity == 'warning')
+        critical_count = totals['critical']
+        warning_count = totals['warning']
         
-        report.append("## Executive Summary\n")
-        report.append(f"- **Systems Checked**: {len(self.workbook.sheetnames)}")
-        report.append(f"- **Total Issues**: {len(self.issues)}")
-        report.append(f"- **Critical**: {critical_count} | **Warnings**: {warning_count}")
+        write("## Executive Summary\n\n")
+        write(f"- **Systems Checked**: {len(sheet_names)}\n")
+        write(f"- **Total Issues**: {len(self.issues)}\n")
+        write(f"- **Critical**: {critical_count} | **Warnings**: {warning_count}\n")
         if self.screenshot_stats['analyzed'] > 0:
-            report.append(f"- **Screenshots Analyzed**: {self.screenshot_stats['analyzed']} (Issues: {self.screenshot_stats['issues']})")
-        report.append("")
+            write(f"- **Screenshots Analyzed**: {self.screenshot_stats['analyzed']} (Issues: {self.screenshot_stats['issues']})\n")
+        write("\n")
         
         if len(self.issues) == 0:
-            report.append("> **All checks passed validation!**\n")
+            write("> **All checks passed validation!**\n\n")
         
         # Metadata summary
-        report.append("## Check Metadata\n")
-        report.append("| System | Date | Time | Performed By |")
-        report.append("|--------|------|------|--------------|")
+        write("## Check Metadata\n\n")
+        write("| System | Date | Time | Performed By |\n")
+        write("|--------|------|------|--------------|\n")
         for sheet_name, meta in self.metadata.items():
             date_str = str(meta['date'])[:10] if meta['date'] else 'N/A'
             time_str = str(meta['time']) if meta['time'] else 'N/A'
-            report.append(f"| {sheet_name} | {date_str} | {time_str} | {meta['performed_by'] or 'N/A'} |")
-        report.append("")
+            write(f"| {sheet_name} | {date_str} | {time_str} | {meta['performed_by'] or 'N/A'} |\n")
+        write("\n")
         
         # Per-system breakdown
-        report.append("## Per-System Findings\n")
+        write("## Per-System Findings\n\n")
         
-        for sheet_name in self.workbook.sheetnames:
-            sheet_issues = [i for i in self.issues if i.sheet == sheet_name]
+        for sheet_name in sheet_names:
+            sheet_issues = by_sheet.get(sheet_name)
             
             if sheet_issues:
-                critical = [i for i in sheet_issues if i.severity == 'critical']
-                warnings = [i for i in sheet_issues if i.severity == 'warning']
+                critical = sheet_issues['critical']
+                warnings = sheet_issues['warning']
+                issue_count = sum(len(group) for group in sheet_issues.values())
                 
                 status = "[CRITICAL]" if critical else "[WARNING]"
-                report.append(f"### {status} {sheet_name}\n")
-                report.append(f"**Issues Found**: {len(sheet_issues)} ({len(critical)} critical, {len(warnings)} warnings)\n")
+                write(f"### {status} {sheet_name}\n\n")
+                write(f"**Issues Found**: {issue_count} ({len(critical)} critical, {len(warnings)} warnings)\n\n")
                 
                 if critical:
-                    report.append("#### Critical Issues\n")
+                    write("#### Critical Issues\n\n")
                     for issue in critical:
-                        report.append(f"- **Row {issue.row}** [{issue.check_type}]: {issue.message}")
+                        write(f"- **Row {issue.row}** [{issue.check_type}]: {issue.message}\n")
                         if issue.context:
-                            report.append(f"  - Context: `{issue.context[:80]}...`" if len(issue.context) > 80 else f"  - Context: `{issue.context}`")
-                    report.append("")
+                            write(f"  - Context: `{issue.context[:80]}...`\n" if len(issue.context) > 80 else f"  - Context: `{issue.context}`\n")
+                    write("\n")
                 
                 if warnings:
-                    report.append("#### Warnings\n")
+                    write("#### Warnings\n\n")
                     for issue in warnings:
-                        report.append(f"- **Row {issue.row}** [{issue.check_type}]: {issue.message}")
-                    report.append("")
+                        write(f"- **Row {issue.row}** [{issue.check_type}]: {issue.message}\n")
+                    write("\n")
             else:
-                report.append(f"### [OK] {sheet_name}\n")
-                report.append("All checks passed validation.\n")
+                write(f"### [OK] {sheet_name}\n\n")
+                write("All checks passed validation.\n\n")
         
         # Recommendations
         if self.issues:
-            report.append("## Recommendations\n")
+            write("## Recommendations\n\n")
             
             if critical_count > 0:
-                report.append("### Immediate Actions Required\n")
-                report.append("1. Review all **critical** issues - these require immediate attention")
-                report.append("2. Ensure negative responses have proper justifications with ticket numbers if applicable")
-                report.append("3. Follow up with the team member who performed the checks\n")
+                write("### Immediate Actions Required\n\n")
+                write("1. Review all **critical** issues - these require immediate attention\n")
+                write("2. Ensure negative responses have proper justifications with ticket numbers if applicable\n")
+                write("3. Follow up with the team member who performed the checks\n\n")
             
             if warning_count > 0:
-                report.append("### Follow-up Items\n")
-                report.append("1. Review warning items for potential issues")
-                report.append("2. Consider adjusting thresholds if warnings are expected behavior")
-                report.append("3. Document any recurring patterns for process improvement\n")
+                write("### Follow-up Items\n\n")
+                write("1. Review warning items for potential issues\n")
+                write("2. Consider adjusting thresholds if warnings are expected behavior\n")
+                write("3. Document any recurring patterns for process improvement\n\n")
         
-        return '\n'.join(report)
+        # Every write ends its line; drop the last newline so the report ends
+        # with a single one, whichever section comes last
+        return buf.getvalue()[:-1]
     
     def save_report(self, output_path: str = None) -> str:
         """Save the audit report to a file."""
@@ -476,6 +652,33 @@ class DailyChecksAuditor:
         return str(output_path)
 
 
+def _usable_cpu_count() -> int:
+    """CPUs this process may run on; unlike os.cpu_count() this honours affinity limits."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _audit_sheet_worker(excel_path: Path, sheet_name: str,
+                        config: dict | None = None) -> tuple[str, dict, list[AuditIssue]]:
+    """Audit a single sheet in a worker process using its own read-only workbook.
+    
+    The workbook is reloaded here, so nothing done to the parent's sheet objects
+    carries over; audit_sheet resets the sheet's recorded dimensions itself.
+    """
+    auditor = DailyChecksAuditor(excel_path, config=config)
+    if not auditor.load_workbook():
+        raise RuntimeError(f"Could not load workbook: {excel_path}")
+    
+    try:
+        sheet_issues = auditor.audit_sheet(sheet_name)
+    finally:
+        auditor.workbook.close()
+    
+    return sheet_name, auditor.metadata[sheet_name], sheet_issues
+
+
 def main():
     """Main entry point."""
     if len(sys.argv) < 2:
@@ -6,21 +6,47 @@ Extracts embedded images from Excel files and uses Azure OpenAI GPT-5.1
 to validate that screenshot content matches reported check values.
 """
 
+import asyncio
+import atexit
 import base64
+import hashlib
+import importlib.util
+import io
+import itertools
 import json
 import os
+import posixpath
 import re
+import tempfile
+import threading
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+from collections import OrderedDict
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Any, List, Optional
+from typing import Any, Iterable, Iterator, List, Optional
 from pydantic import BaseModel, Field
 
 try:
-    from openai import AzureOpenAI
+    import httpx
+    from openai import AsyncAzureOpenAI
     HAS_AZURE = True
 except ImportError:
     HAS_AZURE = False
 
+try:
+    from PIL import Image, ImageFilter, ImageStat
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+try:
+    from python_calamine import CalamineWorkbook
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
 try:
     import openpyxl
     from openpyxl.drawing.image import Image as OpenpyxlImage
@@ -66,9 +92,299 @@ class ScreenshotAnalysisResponse(BaseModel):
         extra = 'forbid'
 
 
+# --- Shared Async Runtime ---
+# All vision requests run on one long-lived background event loop so the
+# AsyncAzureOpenAI client (and its httpx connection pool, which is bound to
+# the loop it first runs on) can be shared by every validator in the process.
+
+_loop: asyncio.AbstractEventLoop | None = None
+_azure_clients: dict[tuple, Any] = {}
+_runtime_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Return the background event loop, starting it on first use."""
+    global _loop
+    with _runtime_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name='screenshot-vision', daemon=True).start()
+            atexit.register(_shutdown)
+        return _loop
+
+
+def _run_sync(coro):
+    """Run a coroutine on the background loop and wait for its result.
+    
+    Safe to call from inside a running event loop (e.g. a sync MCP tool).
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+def _get_azure_client(api_key: str, api_version: str, azure_endpoint: str, max_retries: int):
+    """Return the process-wide AsyncAzureOpenAI client for these settings."""
+    key = (api_key, api_version, azure_endpoint, max_retries)
+    with _runtime_lock:
+        client = _azure_clients.get(key)
+        if client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+                timeout=httpx.Timeout(120.0, connect=10.0),
+                # HTTP/2 needs the optional h2 package
+                http2=importlib.util.find_spec('h2') is not None
+            )
+            client = AsyncAzureOpenAI(
+                api_key=api_key,
+                api_version=api_version,
+                azure_endpoint=azure_endpoint,
+                max_retries=max_retries,
+                http_client=http_client
+            )
+            _azure_clients[key] = client
+        return client
+
+
+def _shutdown() -> None:
+    """Close shared clients and stop the background loop at interpreter exit."""
+    if _loop is None:
+        return
+    
+    async def close_clients():
+        for client in _azure_clients.values():
+            await client.close()
+    
+    try:
+        asyncio.run_coroutine_threadsafe(close_clients(), _loop).result(timeout=5)
+    except Exception:
+        pass
+    _loop.call_soon_threadsafe(_loop.stop)
+
+
+# --- Direct XLSX Image Extraction ---
+# An xlsx is a ZIP package: workbook.xml lists the sheets, each sheet's rels
+# point at a drawing part, and each drawing's rels point at files under
+# xl/media/. Walking those parts yields the embedded images without building
+# openpyxl's cell model.
+
+_NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_NS_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_NS_XDR = '{http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing}'
+_NS_A = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+
+# Anchor kinds in the order openpyxl adds their pictures to sheet._images
+_DRAWING_ANCHORS = ('absoluteAnchor', 'oneCellAnchor', 'twoCellAnchor')
+
+# Image MIME types by leading magic bytes. WebP is a RIFF container and is
+# identified separately by its 'WEBP' form type at bytes 8-12.
+_IMAGE_MAGIC = {
+    b'\x89PNG': b'image/png',
+    b'\xff\xd8\xff': b'image/jpeg',
+    b'GIF8': b'image/gif'
+}
+
+
+def _sniff_image_type(image_bytes: bytes) -> bytes | None:
+    """Return the MIME type of a format the vision API accepts, or None."""
+    if image_bytes.startswith(b'RIFF') and image_bytes[8:12] == b'WEBP':
+        return b'image/webp'
+    return next((mime for magic, mime in _IMAGE_MAGIC.items() if image_bytes.startswith(magic)), None)
+
+
+def _image_mime_type(image_bytes: bytes) -> bytes:
+    """Return the MIME type for image bytes by magic prefix, defaulting to PNG."""
+    return _sniff_image_type(image_bytes) or b'image/png'
+
+
+def _rels_path(part: str) -> str:
+    """Return the relationships part for a package part (a/b.xml -> a/_rels/b.xml.rels)."""
+    folder, name = posixpath.split(part)
+    return posixpath.join(folder, '_rels', name + '.rels')
+
+
+def _read_rels(zf: zipfile.ZipFile, part: str) -> dict[str, tuple[str, str]]:
+    """Map relationship Id -> (Type, resolved target part) for a package part."""
+    rels = {}
+    rels_part = _rels_path(part)
+    try:
+        stream = zf.open(rels_part)
+    except KeyError:
+        return rels
+    
+    folder = posixpath.dirname(part)
+    with stream:
+        for _, elem in ET.iterparse(stream):
+            if elem.tag != _NS_PKG_REL + 'Relationship' or elem.get('TargetMode') == 'External':
+                continue
+            target = elem.get('Target', '')
+            if target.startswith('/'):
+                target = target.lstrip('/')
+            else:
+                target = posixpath.normpath(posixpath.join(folder, target))
+            rels[elem.get('Id')] = (elem.get('Type', ''), target)
+    return rels
+
+
+def _find_rel(rels: dict[str, tuple[str, str]], kind: str) -> list[str]:
+    """Return targets of relationships whose Type ends with /kind."""
+    suffix = '/' + kind
+    return [target for rel_type, target in rels.values() if rel_type.endswith(suffix)]
+
+
+def _xlsx_sheet_images(zf: zipfile.ZipFile) -> list[tuple[str, list[str]]]:
+    """List (sheet_name, [media parts]) in workbook order.
+    
+    Raises KeyError or ET.ParseError if the package structure is not as expected.
+    """
+    workbook_part = _find_rel(_read_rels(zf, ''), 'officeDocument')[0]
+    workbook_rels = _read_rels(zf, workbook_part)
+    workbook = ET.fromstring(zf.read(workbook_part))
+    
+    sheets = []
+    for sheet in workbook.iter(_NS_MAIN + 'sheet'):
+        rel = workbook_rels.get(sheet.get(_NS_REL + 'id'))
+        if rel is None or not rel[0].endswith('/worksheet'):
+            continue
+        
+        media = []
+        for drawing_part in _find_rel(_read_rels(zf, rel[1]), 'drawing'):
+            drawing_rels = _read_rels(zf, drawing_part)
+            drawing = ET.fromstring(zf.read(drawing_part))
+            for kind in _DRAWING_ANCHORS:
+                for anchor in drawing.iter(_NS_XDR + kind):
+                    pic = anchor.find(_NS_XDR + 'pic')
+                    if pic is None:
+                        pic = anchor.find(f'{_NS_XDR}grpSp/{_NS_XDR}pic')
+                    blip = None if pic is None else pic.find(f'{_NS_XDR}blipFill/{_NS_A}blip')
+                    if blip is None:
+                        continue
+                    image_rel = drawing_rels.get(blip.get(_NS_REL + 'embed'))
+                    if image_rel is not None and image_rel[0].endswith('/image'):
+                        media.append(image_rel[1])
+        sheets.append((sheet.get('name'), media))
+    return sheets
+
+
+# --- Response Cache ---
+
+class ImageCache:
+    """LRU cache of vision responses with a memory tier and a JSON-file disk tier.
+    
+    Entries expire after their TTL. Disk writes go through a temp file and an
+    atomic rename, and the disk tier is pruned to max_size files (oldest first).
+    Disk errors are ignored: the cache is best-effort.
+    """
+    
+    DEFAULT_TTL = 30 * 86400  # 30 days
+    
+    def __init__(self, cache_dir: str | Path | None = None, max_size: int = 1000):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / '.cache' / 'sap-audit-screenshots'
+        self.max_size = max_size
+        self._memory: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+    
+    def _path(self, key: str) -> Path:
+        # Keys contain ':' which is not valid in Windows file names
+        return self.cache_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+    
+    def get(self, key: str) -> dict | None:
+        """Return the cached value for key, or None on a miss or expired entry."""
+        entry = self._memory.get(key)
+        if entry is None:
+            try:
+                with open(self._path(key), 'r', encoding='utf-8') as f:
+                    stored = json.load(f)
+                entry = (stored['expires'], stored['value'])
+            except (OSError, ValueError, KeyError):
+                return None
+        
+        expires, value = entry
+        if expires < time.time():
+            self._memory.pop(key, None)
+            self._path(key).unlink(missing_ok=True)
+            return None
+        
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        return value
+    
+    def set(self, key: str, value: dict, ttl: float | None = None) -> None:
+        """Store value under key in both tiers."""
+        expires = time.time() + (self.DEFAULT_TTL if ttl is None else ttl)
+        self._memory[key] = (expires, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+        
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'expires': expires, 'value': value}, f)
+            os.replace(tmp_path, self._path(key))
+            self._prune_disk()
+        except OSError as e:
+            print(f"Warning: Could not write screenshot cache entry: {e}")
+    
+    def _prune_disk(self) -> None:
+        """Drop the least recently written files beyond max_size."""
+        files = list(self.cache_dir.glob('*.json'))
+        if len(files) <= self.max_size:
+            return
+        files.sort(key=lambda path: path.stat().st_mtime)
+        for path in files[:len(files) - self.max_size]:
+            path.unlink(missing_ok=True)
+    
+    def clear_cache(self) -> None:
+        """Remove all entries from memory and disk."""
+        self._memory.clear()
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob('*.json'):
+                path.unlink(missing_ok=True)
+
+
+# Shared by all validators so repeated runs in one process hit the memory tier
+DEFAULT_IMAGE_CACHE = ImageCache()
+
+
+def _to_strict_schema(node: Any) -> Any:
+    """Apply the structured-outputs strict rules to a Pydantic JSON schema.
+    
+    Every object gets additionalProperties: false and lists all of its
+    properties as required; null defaults are dropped.
+    """
+    if isinstance(node, list):
+        return [_to_strict_schema(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+    
+    node = {key: _to_strict_schema(value) for key, value in node.items()
+            if not (key == 'default' and value is None)}
+    if node.get('type') == 'object' and 'properties' in node:
+        node.setdefault('additionalProperties', False)
+        node['required'] = list(node['properties'])
+    return node
+
+
+def _build_response_format(model: type[BaseModel]) -> dict:
+    """Build the strict json_schema response_format for a Pydantic model."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "schema": _to_strict_schema(model.model_json_schema()),
+            "name": model.__name__,
+            "strict": True
+        }
+    }
+
+
+# Structured-output response_format, built once at import and sent verbatim on
+# every request (interactive and batch) so request bodies are byte-identical.
+_RESPONSE_FORMAT = _build_response_format(ScreenshotAnalysisResponse) if HAS_AZURE else None
+
+
 # --- Internal Data Structures ---
 
-@dataclass
+@dataclass(slots=True)
 class ScreenshotAnalysis:
     """Results from analyzing a screenshot."""
     image_name: str
@@ -78,7 +394,7 @@ class ScreenshotAnalysis:
     raw_response: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationIssue:
     """A discrepancy between screenshot and reported values."""
     sheet: str
@@ -100,12 +416,61 @@ You MUST extract these integers.
 If the image shows a table, count the rows or find summary numbers.
 If the image is unrelated, classify as 'other'."""
 
-    def __init__(self, workbook_path: str):
+    # Maximum number of vision requests in flight at once
+    MAX_CONCURRENT_REQUESTS = 10
+    # Retries (with exponential backoff) handled by the OpenAI client
+    MAX_RETRIES = 3
+    # Prescreen for extract_reported_values: all reported-value rules contain 'failed'
+    _RE_FAILED = re.compile('failed', re.IGNORECASE)
+    
+    # Failure metrics cross-checked between screenshot and cells: (key, message label)
+    REPORTED_METRICS = (
+        ('failed_data_backup', 'failed data backups'),
+        ('failed_log_backup', 'failed log backups'),
+        ('failed_jobs', 'failed jobs'),
+    )
+    
+    # Images below the pixel bound (logos, icons, signatures) are not sent for
+    # analysis; they get SKIPPED_RESULT and are left out of self.analyses.
+    # Without Pillow the pixel count is unknown and the byte bound is used
+    # instead; it is kept low because flat screenshots compress very well
+    MIN_IMAGE_PIXELS = 50_000
+    MIN_IMAGE_BYTES = 1_000
+    SKIPPED_RESULT = {'type': 'other', 'summary': 'skipped: too small', 'data': {}}
+    
+    # Adaptive detail: "low" detail shows the model at most 512x512 pixels,
+    # which loses small numeric cells in a dense table. Larger images whose
+    # share of edge pixels at that size exceeds the threshold go at "high"
+    LOW_DETAIL_DIM = 512
+    HIGH_DETAIL_EDGE_DENSITY = 0.05
+    
+    # Batch job polling interval bounds, in seconds
+    BATCH_POLL_INITIAL = 10
+    BATCH_POLL_MAX = 300
+
+    def __init__(self, workbook_path: str, max_dim: int = 1024, detail: str = "adaptive",
+                 cache: ImageCache | None = None):
         self.workbook_path = Path(workbook_path)
-        self.workbook = None
-        self.extracted_images: list[tuple[str, str, bytes]] = []
+        self.cache = cache if cache is not None else DEFAULT_IMAGE_CACHE
+        # Vision payload budget: longest image side sent to the model, and the
+        # image_url detail level ("low", "high", "auto", or "adaptive" to pick
+        # low/high per image). "low" is a flat ~85 tokens per image but only
+        # 512px of resolution; "high" reads small text at several times the cost
+        self.max_dim = max_dim
+        self.detail = detail
+        # Full openpyxl workbook, only loaded by the image-extraction fallback;
+        # value scans use calamine or a read-only handle opened on demand
+        self._image_wb = None
+        self._ro_wb = None
+        self._calamine_wb = None
+        # Number of images yielded by iter_images(); the bytes are not retained
+        self.extracted_images = 0
+        # Number of images skipped as too small or animated to be screenshots
+        self.skipped_images = 0
         self.analyses: list[ScreenshotAnalysis] = []
         self.validation_issues: list[ValidationIssue] = []
+        # Reported cell values per sheet, so each sheet is scanned only once
+        self._reported_cache: dict[str, dict] = {}
         
         # Initialize Azure Client
         self.azure_client = None
@@ -116,61 +481,213 @@ If the image is unrelated, classify as 'other'."""
         
         if HAS_AZURE and azure_key and azure_endpoint:
             self.use_azure = True
-            self.azure_client = AzureOpenAI(
+            self.azure_client = _get_azure_client(
                 api_key=azure_key,
                 api_version=os.environ.get('AZURE_OPENAI_API_VERSION', '2024-08-01-preview'),
-                azure_endpoint=azure_endpoint
+                azure_endpoint=azure_endpoint,
+                max_retries=self.MAX_RETRIES
             )
             self.azure_deployment = os.environ.get('AZURE_OPENAI_DEPLOYMENT_NAME', 'gpt-5.1')
     
-    def extract_images_from_excel(self) -> list[tuple[str, str, bytes]]:
-        """Extract all embedded images from the Excel workbook."""
-        self.workbook = openpyxl.load_workbook(self.workbook_path)
-        images = []
+    def iter_images(self) -> Iterator[tuple[str, str, bytes]]:
+        """Yield (sheet_name, image_id, image_bytes) for each embedded image.
+        
+        Images are produced one at a time so callers never hold the whole set
+        in memory; self.extracted_images counts how many were yielded.
+        Images are read straight from the xlsx package, falling back to
+        openpyxl when the file is not a ZIP or its structure is unexpected.
+        """
+        self.extracted_images = 0
+        
+        try:
+            zf = zipfile.ZipFile(self.workbook_path)
+        except zipfile.BadZipFile:
+            yield from self._iter_images_openpyxl()
+            return
+        
+        with zf:
+            try:
+                sheets = _xlsx_sheet_images(zf)
+            except (KeyError, IndexError, ET.ParseError) as e:
+                print(f"Warning: Could not read image parts directly ({e}); falling back to openpyxl")
+                sheets = None
+            
+            if sheets is not None:
+                for sheet_name, media in sheets:
+                    for idx, part in enumerate(media):
+                        try:
+                            image_data = self._read_media(zf, part)
+                        except Exception as e:
+                            print(f"Warning: Could not extract image {idx} from {sheet_name}: {e}")
+                            continue
+                        self.extracted_images += 1
+                        yield sheet_name, f"{sheet_name}_img_{idx}", image_data
+                return
+        
+        yield from self._iter_images_openpyxl()
+    
+    @staticmethod
+    def _read_media(zf: zipfile.ZipFile, part: str) -> bytes:
+        """Read one media file, re-encoding formats other than PNG/JPEG/GIF/WebP to PNG."""
+        image_data = zf.read(part)
+        if _sniff_image_type(image_data) is not None:
+            return image_data
+        if not HAS_PIL:
+            raise ValueError(f"{posixpath.basename(part)} needs Pillow to convert to PNG")
+        with Image.open(io.BytesIO(image_data)) as img:
+            out = io.BytesIO()
+            img.save(out, format='PNG')
+        return out.getvalue()
+    
+    def _iter_images_openpyxl(self) -> Iterator[tuple[str, str, bytes]]:
+        """Yield embedded images by loading the workbook with openpyxl."""
+        self._image_wb = openpyxl.load_workbook(self.workbook_path)
         
-        for sheet_name in self.workbook.sheetnames:
-            sheet = self.workbook[sheet_name]
+        for sheet_name in self._image_wb.sheetnames:
+            sheet = self._image_wb[sheet_name]
             if hasattr(sheet, '_images'):
                 for idx, img in enumerate(sheet._images):
                     try:
                         image_data = img._data()
-                        image_id = f"{sheet_name}_img_{idx}"
-                        images.append((sheet_name, image_id, image_data))
                     except Exception as e:
                         print(f"Warning: Could not extract image {idx} from {sheet_name}: {e}")
+                        continue
+                    self.extracted_images += 1
+                    yield sheet_name, f"{sheet_name}_img_{idx}", image_data
+    
+    def extract_images_from_excel(self) -> list[tuple[str, str, bytes]]:
+        """Extract all embedded images from the Excel workbook."""
+        return list(self.iter_images())
+    
+    def downscale_image(self, image_bytes: bytes) -> bytes:
+        """Shrink images larger than max_dim and re-encode them as JPEG.
+        
+        Returns the original bytes when Pillow is unavailable, the image is
+        already small enough, or it cannot be decoded.
+        """
+        if not HAS_PIL:
+            return image_bytes
         
-        self.extracted_images = images
-        return images
+        try:
+            img = Image.open(io.BytesIO(image_bytes))
+            if max(img.size) <= self.max_dim:
+                return image_bytes
+            
+            img.thumbnail((self.max_dim, self.max_dim), Image.LANCZOS)
+            if img.mode not in ('RGB', 'L'):
+                img = img.convert('RGB')
+            
+            out = io.BytesIO()
+            img.save(out, format='JPEG', quality=85)
+            return out.getvalue()
+        except Exception as e:
+            print(f"Warning: Could not downscale image, sending original: {e}")
+            return image_bytes
     
-    def analyze_image_with_azure(self, image_bytes: bytes, image_name: str) -> dict | None:
-        """Use Azure OpenAI with Structured Outputs via beta.parse()."""
+    def pick_detail(self, image_bytes: bytes) -> str:
+        """image_url detail level for one image under the "adaptive" setting.
+        
+        Images that fit in the low-detail resolution, or carry little fine
+        detail at that size, go at "low"; large text-dense ones at "high".
+        Without Pillow the choice is left to the service ("auto").
+        """
+        if not HAS_PIL:
+            return "auto"
+        
+        try:
+            with Image.open(io.BytesIO(image_bytes)) as img:
+                if max(img.size) <= self.LOW_DETAIL_DIM:
+                    return "low"
+                gray = img.convert('L')
+            gray.thumbnail((self.LOW_DETAIL_DIM, self.LOW_DETAIL_DIM))
+            edges = gray.filter(ImageFilter.FIND_EDGES).point(lambda v: 255 if v > 64 else 0)
+            density = ImageStat.Stat(edges).mean[0] / 255
+        except Exception:
+            return "auto"
+        return "high" if density > self.HIGH_DETAIL_EDGE_DENSITY else "low"
+    
+    def is_trivial_image(self, image_bytes: bytes) -> bool:
+        """True for images too small (or animated) to be a data screenshot.
+        
+        The pixel and animation checks need Pillow; without it only the byte
+        size is checked.
+        """
+        if not HAS_PIL:
+            return len(image_bytes) < self.MIN_IMAGE_BYTES
+        
+        try:
+            with Image.open(io.BytesIO(image_bytes)) as img:
+                width, height = img.size
+                return (width * height < self.MIN_IMAGE_PIXELS
+                        or (img.format == 'GIF' and getattr(img, 'is_animated', False)))
+        except Exception:
+            return False
+    
+    def cache_key(self, image_bytes: bytes) -> str:
+        """Cache key for an image: its content plus everything that shapes the response."""
+        prompt_version = hashlib.sha256(self.VISION_PROMPT.encode('utf-8')).hexdigest()[:12]
+        return ':'.join([
+            hashlib.sha256(image_bytes).hexdigest(),
+            self.azure_deployment,
+            prompt_version,
+            str(self.max_dim),
+            self.detail
+        ])
+    
+    def build_messages(self, image_bytes: bytes) -> list[dict]:
+        """Build the chat messages for one screenshot: static prompt first, then the image."""
+        image_bytes = self.downscale_image(image_bytes)
+        mime_type = _image_mime_type(image_bytes)
+        detail = self.pick_detail(image_bytes) if self.detail == "adaptive" else self.detail
+        # Assemble the data URL as bytes and decode once
+        data_url = b'data:' + mime_type + b';base64,' + base64.b64encode(image_bytes)
+        
+        return [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": self.VISION_PROMPT},
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": data_url.decode('ascii'),
+                            "detail": detail
+                        }
+                    }
+                ]
+            }
+        ]
+    
+    async def analyze_image_with_azure(self, image_bytes: bytes, image_name: str) -> dict | None:
+        """Use Azure OpenAI with Structured Outputs using the precomputed schema."""
         if not self.azure_client:
             return None
 
-        try:
-            image_b64 = base64.standard_b64encode(image_bytes).decode('utf-8')
-            mime_type = "image/png"
-            if image_bytes[:2] == b'\xff\xd8':
-                mime_type = "image/jpeg"
+        if self.is_trivial_image(image_bytes):
+            print(f"  Skipping {image_name}: too small to be a screenshot")
+            self.skipped_images += 1
+            return dict(self.SKIPPED_RESULT, data={})
 
-            # Use the new beta parse method which handles Pydantic schemas automatically
-            completion = self.azure_client.beta.chat.completions.parse(
+        key = self.cache_key(image_bytes)
+        cached = self.cache.get(key)
+        if cached is not None:
+            print(f"  Cache hit for {image_name}")
+            return cached
+
+        try:
+            completion = await self.azure_client.chat.completions.create(
                 model=self.azure_deployment,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": self.VISION_PROMPT},
-                            {
-                                "type": "image_url",
-                                "image_url": {"url": f"data:{mime_type};base64,{image_b64}"}
-                            }
-                        ]
-                    }
-                ],
-                response_format=ScreenshotAnalysisResponse
+                messages=self.build_messages(image_bytes),
+                response_format=_RESPONSE_FORMAT
             )
             
+            # cached_tokens shows prompt-cache hits on the static prompt prefix
+            usage = completion.usage
+            if usage is not None:
+                details = getattr(usage, 'prompt_tokens_details', None)
+                cached_tokens = getattr(details, 'cached_tokens', 0) or 0
+                print(f"  {image_name}: {usage.prompt_tokens} prompt tokens ({cached_tokens} cached)")
+            
             message = completion.choices[0].message
             
             # If the model refused to parse, it might be a refusal
@@ -178,8 +695,10 @@ If the image is unrelated, classify as 'other'."""
                 print(f"Refusal for {image_name}: {message.refusal}")
                 return None
             
-            if message.parsed:
-                return message.parsed.model_dump()
+            if message.content:
+                result = ScreenshotAnalysisResponse.model_validate_json(message.content).model_dump()
+                self.cache.set(key, result)
+                return result
                 
             return None
 
@@ -187,37 +706,231 @@ If the image is unrelated, classify as 'other'."""
             print(f"Error analyzing image {image_name} with Azure: {e}")
             return None
 
-    def analyze_all_images(self) -> list[ScreenshotAnalysis]:
-        """Analyze all extracted images."""
+    async def _analyze_one(self, semaphore: asyncio.Semaphore, sheet_name: str,
+                           image_id: str, image_bytes: bytes) -> ScreenshotAnalysis | None:
+        """Analyze a single image, releasing the caller-acquired semaphore slot when done."""
+        try:
+            print(f"  Analyzing {image_id}...")
+            result = await self.analyze_image_with_azure(image_bytes, image_id)
+        finally:
+            semaphore.release()
+        
+        if result is None or result == self.SKIPPED_RESULT:
+            return None
+        
+        return self._to_analysis(sheet_name, image_id, result)
+    
+    def _to_analysis(self, sheet_name: str, image_id: str, result: dict) -> ScreenshotAnalysis:
+        """Wrap a parsed vision response as a ScreenshotAnalysis."""
+        return ScreenshotAnalysis(
+            image_name=image_id,
+            sheet_name=sheet_name,
+            analysis_type=result.get('type', 'unknown'),
+            extracted_data=result.get('data', {}),
+            raw_response=result.get('summary', '')
+        )
+    
+    async def analyze_all_images_async(self, images: Iterable[tuple[str, str, bytes]] | None = None
+                                       ) -> list[ScreenshotAnalysis]:
+        """Analyze images (default: iter_images()) with concurrent vision requests.
+        
+        A semaphore slot is taken before each image is pulled from the iterable,
+        so at most MAX_CONCURRENT_REQUESTS images are held in memory at once.
+        Must run on the shared background loop; use analyze_all_images() from
+        synchronous code.
+        """
         analyses = []
         
-        for sheet_name, image_id, image_bytes in self.extracted_images:
-            print(f"  Analyzing {image_id}...")
+        if self.use_azure:
+            if images is None:
+                images = self.iter_images()
+            semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+            image_ids = []
+            tasks = []
+            
+            await semaphore.acquire()
+            for sheet_name, image_id, image_bytes in images:
+                image_ids.append(image_id)
+                tasks.append(asyncio.create_task(
+                    self._analyze_one(semaphore, sheet_name, image_id, image_bytes)
+                ))
+                del image_bytes
+                await semaphore.acquire()
+            semaphore.release()
+            
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            
+            for image_id, result in zip(image_ids, results):
+                if isinstance(result, BaseException):
+                    print(f"Error analyzing image {image_id}: {result}")
+                elif result is not None:
+                    analyses.append(result)
+        
+        self.analyses = analyses
+        return analyses
+    
+    def analyze_all_images(self, images: Iterable[tuple[str, str, bytes]] | None = None
+                           ) -> list[ScreenshotAnalysis]:
+        """Analyze all extracted images."""
+        return _run_sync(self.analyze_all_images_async(images))
+    
+    async def analyze_all_images_batch_async(self, images: Iterable[tuple[str, str, bytes]] | None = None
+                                             ) -> list[ScreenshotAnalysis]:
+        """Analyze images (default: iter_images()) through the Azure OpenAI Batch API.
+        
+        Cached images are answered locally; the rest are submitted as one batch
+        job and polled until it finishes (up to the 24h completion window).
+        Must run on the shared background loop; use analyze_all_images_batch()
+        from synchronous code.
+        """
+        if images is None:
+            images = self.iter_images()
+        results: dict[int, dict] = {}
+        # Per image: (sheet_name, image_id, cache_key); the bytes are not kept
+        entries: list[tuple[str, str, str]] = []
+        lines = []
+        submitted: list[int] = []
+        
+        for idx, (sheet_name, image_id, image_bytes) in enumerate(images):
+            key = self.cache_key(image_bytes)
+            entries.append((sheet_name, image_id, key))
+            if self.is_trivial_image(image_bytes):
+                print(f"  Skipping {image_id}: too small to be a screenshot")
+                self.skipped_images += 1
+                continue
+            cached = self.cache.get(key)
+            if cached is not None:
+                print(f"  Cache hit for {image_id}")
+                results[idx] = cached
+                continue
+            
+            submitted.append(idx)
+            lines.append(json.dumps({
+                "custom_id": str(idx),
+                "method": "POST",
+                "url": "/chat/completions",
+                "body": {
+                    "model": self.azure_deployment,
+                    "messages": self.build_messages(image_bytes),
+                    "response_format": _RESPONSE_FORMAT
+                }
+            }))
+        
+        if lines:
+            print(f"  Submitting batch of {len(lines)} images...")
+            batch_file = await self.azure_client.files.create(
+                file=("screenshots.jsonl", '\n'.join(lines).encode('utf-8')),
+                purpose="batch"
+            )
+            batch = await self.azure_client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/chat/completions",
+                completion_window="24h"
+            )
+            
+            # Poll with exponential backoff
+            delay = self.BATCH_POLL_INITIAL
+            while batch.status not in ('completed', 'failed', 'expired', 'cancelled'):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.BATCH_POLL_MAX)
+                batch = await self.azure_client.batches.retrieve(batch.id)
+            
+            print(f"  Batch {batch.id} finished with status '{batch.status}'")
+            if batch.status != 'completed':
+                # Job-level failures (e.g. input validation) are reported on the batch itself
+                for error in getattr(getattr(batch, 'errors', None), 'data', None) or []:
+                    print(f"Warning: Batch {batch.id} error: {error.code}: {error.message}")
+            
+            if batch.output_file_id:
+                for record in await self._read_batch_file(batch.output_file_id):
+                    idx = int(record['custom_id'])
+                    _, image_id, key = entries[idx]
+                    error = self._batch_record_error(record)
+                    if error:
+                        print(f"Batch request failed for {image_id}: {error}")
+                        continue
+                    try:
+                        content = record['response']['body']['choices'][0]['message']['content']
+                        result = ScreenshotAnalysisResponse.model_validate_json(content).model_dump()
+                    except Exception as e:
+                        print(f"Error parsing batch result for {image_id}: {e}")
+                        continue
+                    self.cache.set(key, result)
+                    results[idx] = result
             
-            result = None
-            if self.use_azure:
-                result = self.analyze_image_with_azure(image_bytes, image_id)
+            # Requests that failed outright are written to a separate error file
+            if getattr(batch, 'error_file_id', None):
+                for record in await self._read_batch_file(batch.error_file_id):
+                    _, image_id, _ = entries[int(record['custom_id'])]
+                    print(f"Batch request failed for {image_id}: {self._batch_record_error(record) or 'unknown error'}")
             
-            if result is not None:
-                analysis = ScreenshotAnalysis(
-                    image_name=image_id,
-                    sheet_name=sheet_name,
-                    analysis_type=result.get('type', 'unknown'),
-                    extracted_data=result.get('data', {}),
-                    raw_response=result.get('summary', '')
-                )
-                analyses.append(analysis)
+            missing = sum(1 for idx in submitted if idx not in results)
+            if missing:
+                print(f"Warning: {missing} of {len(lines)} submitted images returned no analysis")
         
+        analyses = [
+            self._to_analysis(sheet_name, image_id, results[idx])
+            for idx, (sheet_name, image_id, _) in enumerate(entries)
+            if idx in results
+        ]
         self.analyses = analyses
         return analyses
     
+    async def _read_batch_file(self, file_id: str) -> list[dict]:
+        """Download a batch output/error file and parse its JSONL records."""
+        content = await self.azure_client.files.content(file_id)
+        return [json.loads(line) for line in content.text.splitlines() if line.strip()]
+    
+    @staticmethod
+    def _batch_record_error(record: dict) -> str | None:
+        """Return the error message of a failed batch record, or None if it succeeded."""
+        error = record.get('error')
+        response = record.get('response') or {}
+        if not error and response.get('status_code', 200) < 400:
+            return None
+        error = error or (response.get('body') or {}).get('error') or {}
+        if isinstance(error, dict):
+            return f"{error.get('code', 'error')}: {error.get('message', 'no message')}"
+        return str(error)
+    
+    def analyze_all_images_batch(self, images: Iterable[tuple[str, str, bytes]] | None = None
+                                 ) -> list[ScreenshotAnalysis]:
+        """Analyze all extracted images with a (non-interactive) batch job."""
+        return _run_sync(self.analyze_all_images_batch_async(images))
+    
+    def _get_values_workbook(self):
+        """Return the read-only workbook used for cell value scans, opening it once."""
+        if self._ro_wb is None:
+            self._ro_wb = openpyxl.load_workbook(self.workbook_path, read_only=True, data_only=True)
+        return self._ro_wb
+    
+    def _iter_value_rows(self, sheet_name: str) -> Iterable[tuple | list]:
+        """Return a sheet's cell values row by row.
+        
+        Uses python-calamine when installed and the image workbook has not
+        been loaded with openpyxl; otherwise the read-only openpyxl workbook.
+        """
+        if HAS_CALAMINE and self._image_wb is None:
+            if self._calamine_wb is None:
+                self._calamine_wb = CalamineWorkbook.from_path(self.workbook_path)
+            return self._calamine_wb.get_sheet_by_name(sheet_name).to_python()
+        
+        sheet = self._get_values_workbook()[sheet_name]
+        # Read-only iteration stops at the recorded dimension, which some
+        # writers under-report; streaming does not need it, so drop it
+        sheet.reset_dimensions()
+        return sheet.iter_rows(min_row=1, values_only=True)
+    
     def extract_reported_values(self, sheet_name: str) -> dict:
         """Extract the reported check values from a sheet."""
-        sheet = self.workbook[sheet_name]
         values = {}
         failed_jobs_total = 0
         
-        for row in sheet.iter_rows(min_row=1, values_only=True):
+        for row in self._iter_value_rows(sheet_name):
+            # Every rule below needs 'failed'; skip the join/lower for other rows
+            if not any(self._RE_FAILED.search(cell) for cell in row if isinstance(cell, str)):
+                continue
+            
             row_text = ' '.join(str(cell) for cell in row if cell).lower()
             
             if 'failed data backup' in row_text:
@@ -253,50 +966,25 @@ If the image is unrelated, classify as 'other'."""
             if analysis.analysis_type == 'unknown':
                 continue
             
-            reported = self.extract_reported_values(analysis.sheet_name)
+            reported = self._reported_cache.get(analysis.sheet_name)
+            if reported is None:
+                reported = self.extract_reported_values(analysis.sheet_name)
+                self._reported_cache[analysis.sheet_name] = reported
             extracted = analysis.extracted_data
             
-            # Check failed data backup
-            if extracted.get('failed_data_backup') is not None:
-                screenshot_val = extracted['failed_data_backup']
-                reported_val = reported.get('failed_data_backup')
-                
-                if reported_val is not None and screenshot_val != reported_val:
-                    issues.append(ValidationIssue(
-                        sheet=analysis.sheet_name,
-                        image_name=analysis.image_name,
-                        severity='critical',
-                        message=f'Screenshot shows {screenshot_val} failed data backups but cell reports {reported_val}',
-                        screenshot_value=screenshot_val,
-                        reported_value=reported_val
-                    ))
-            
-            # Check failed log backup
-            if extracted.get('failed_log_backup') is not None:
-                screenshot_val = extracted['failed_log_backup']
-                reported_val = reported.get('failed_log_backup')
-                
-                if reported_val is not None and screenshot_val != reported_val:
-                    issues.append(ValidationIssue(
-                        sheet=analysis.sheet_name,
-                        image_name=analysis.image_name,
-                        severity='critical',
-                        message=f'Screenshot shows {screenshot_val} failed log backups but cell reports {reported_val}',
-                        screenshot_value=screenshot_val,
-                        reported_value=reported_val
-                    ))
-            
-            # Check failed jobs
-            if extracted.get('failed_jobs') is not None:
-                screenshot_val = extracted['failed_jobs']
-                reported_val = reported.get('failed_jobs')
+            # Compare each failure metric the screenshot reports against the cell value
+            for key, label in self.REPORTED_METRICS:
+                screenshot_val = extracted.get(key)
+                if screenshot_val is None:
+                    continue
+                reported_val = reported.get(key)
                 
                 if reported_val is not None and screenshot_val != reported_val:
                     issues.append(ValidationIssue(
                         sheet=analysis.sheet_name,
                         image_name=analysis.image_name,
                         severity='critical',
-                        message=f'Screenshot shows {screenshot_val} failed jobs but cell reports {reported_val}',
+                        message=f'Screenshot shows {screenshot_val} {label} but cell reports {reported_val}',
                         screenshot_value=screenshot_val,
                         reported_value=reported_val
                     ))
@@ -318,34 +1006,61 @@ If the image is unrelated, classify as 'other'."""
                     reported_value=0
                 ))
         
-        self.validation_issues = issues
-        
         self.validation_issues = issues
         return issues
     
-    def run_validation(self) -> tuple[list[ScreenshotAnalysis], list[ValidationIssue]]:
-        """Run the complete validation workflow."""
-        print("[SCREENSHOT] Extracting images from Excel...")
-        images = self.extract_images_from_excel()
-        
-        if not images:
-            print("[SCREENSHOT] No embedded images found")
-            return [], []
-        
-        print(f"[SCREENSHOT] Found {len(images)} embedded images")
-        
-        if not self.use_azure:
-            print("[SCREENSHOT] Azure OpenAI API not configured - skipping vision analysis")
-            print("[SCREENSHOT] Set AZURE_OPENAI_API_KEY and ENDPOINT in .env")
-            return [], []
-        
-        print("[SCREENSHOT] Analyzing images with Azure OpenAI (Structured)...")
-        self.analyze_all_images()
-        
-        print("[SCREENSHOT] Validating against reported values...")
-        self.validate_against_reports()
+    def close(self) -> None:
+        """Close any workbooks opened during validation."""
+        for wb in (self._image_wb, self._ro_wb, self._calamine_wb):
+            if wb is not None:
+                wb.close()
+        self._image_wb = None
+        self._ro_wb = None
+        self._calamine_wb = None
+    
+    def run_validation(self, batch: bool = False) -> tuple[list[ScreenshotAnalysis], list[ValidationIssue]]:
+        """Run the complete validation workflow.
         
-        return self.analyses, self.validation_issues
+        With batch=True the vision calls go through the Azure OpenAI Batch API,
+        which is cheaper but may take up to 24 hours.
+        """
+        try:
+            # Per-run count; iter_images() resets extracted_images the same way
+            self.skipped_images = 0
+            print("[SCREENSHOT] Extracting images from Excel...")
+            images = self.iter_images()
+            first = next(images, None)
+            
+            if first is None:
+                print("[SCREENSHOT] No embedded images found")
+                return [], []
+            
+            images = itertools.chain([first], images)
+            
+            if not self.use_azure:
+                for _ in images:
+                    pass
+                print(f"[SCREENSHOT] Found {self.extracted_images} embedded images")
+                print("[SCREENSHOT] Azure OpenAI API not configured - skipping vision analysis")
+                print("[SCREENSHOT] Set AZURE_OPENAI_API_KEY and ENDPOINT in .env")
+                return [], []
+            
+            if batch:
+                print("[SCREENSHOT] Analyzing images with Azure OpenAI Batch API...")
+                self.analyze_all_images_batch(images)
+            else:
+                print("[SCREENSHOT] Analyzing images with Azure OpenAI (Structured)...")
+                self.analyze_all_images(images)
+            
+            print(f"[SCREENSHOT] Analyzed {len(self.analyses)} of {self.extracted_images} embedded images"
+                  f" ({self.skipped_images} skipped as too small)")
+            
+            print("[SCREENSHOT] Validating against reported values...")
+            self.validate_against_reports()
+            
+            return self.analyses, self.validation_issues
+        finally:
+            self.close()
 
 
 def main():
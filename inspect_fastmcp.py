@@ -1,5 +0,0 @@
-
-from mcp.server.fastmcp import FastMCP
-import inspect
-
-print(inspect.signature(FastMCP.__init__))
@@ -1,2 +0,0 @@
-from mcp.server.fastmcp import FastMCP
-print(dir(FastMCP))
@@ -16,10 +16,12 @@ from contextlib import asynccontextmanager
 # 1. Initialize FastMCP
 _ = mcp.streamable_http_app()
 
-# Health check logic
-async def health_response(scope, receive, send):
-    response = PlainTextResponse("OK")
-    await response(scope, receive, send)
+# Routing constants and responses, built once at import time.
+# Starlette responses hold no per-request state, so one instance serves every scope.
+_MCP_PREFIX = b"/mcp"
+_HEALTH_PATHS = (b"/", b"/health")
+_HEALTH_RESPONSE = PlainTextResponse("OK")
+_NOT_FOUND_RESPONSE = PlainTextResponse("Not Found", status_code=404)
 
 # 2. Manual Lifespan 
 @asynccontextmanager
@@ -43,23 +45,22 @@ async def asgi_app(scope, receive, send):
                     await send({"type": "lifespan.shutdown.complete"})
                     return
 
-    # Routing logic at the base level
-    path = scope.get("path", "")
+    # Routing logic at the base level (raw bytes; no per-request decoding)
+    raw_path = scope.get("raw_path") or scope.get("path", "").encode()
     
     # CASE 1: The MCP endpoint (Bypass everything)
-    if path.startswith("/mcp"):
-        print(f"ASGI Native: Routing {path} to MCP Session Manager")
+    if raw_path.startswith(_MCP_PREFIX):
+        print(f"ASGI Native: Routing {scope.get('path', '')} to MCP Session Manager")
         await mcp.session_manager.handle_request(scope, receive, send)
         return
 
     # CASE 2: The Health check
-    if path == "/" or path == "/health":
-        await health_response(scope, receive, send)
+    if raw_path in _HEALTH_PATHS:
+        await _HEALTH_RESPONSE(scope, receive, send)
         return
 
     # CASE 3: Fallback 404
-    response = PlainTextResponse("Not Found", status_code=404)
-    await response(scope, receive, send)
+    await _NOT_FOUND_RESPONSE(scope, receive, send)
 
 # Wrap with ProxyHeaders to ensure IP/Protocol is correct
 app = ProxyHeadersMiddleware(asgi_app, trusted_hosts="*")
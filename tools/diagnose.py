@@ -0,0 +1,186 @@
+"""
+Diagnostics for the MCP server deployment.
+
+Replaces the old inspect_*.py, reproduce_issue.py and verify_installation.py
+scripts. Several checks can run in one interpreter so the FastMCP / openpyxl /
+openai imports are paid once:
+
+    python tools/diagnose.py routes middleware reproduce verify
+"""
+
+import argparse
+import asyncio
+import functools
+import inspect
+import sys
+from pathlib import Path
+
+# Make `src` importable when run as `python tools/diagnose.py`
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+AZURE_HOST = "daily-checks-audit-app.azurewebsites.net"
+
+
+@functools.lru_cache(maxsize=None)
+def load_server_http():
+    """Import src.server_http once and share it across checks."""
+    from src import server_http
+    return server_http
+
+
+def check_routes():
+    """Inspect a throwaway FastMCP app (no project imports needed)."""
+    from mcp.server.fastmcp import FastMCP
+
+    print(f"FastMCP.__init__{inspect.signature(FastMCP.__init__)}")
+    print(f"FastMCP attributes: {[name for name in dir(FastMCP) if not name.startswith('_')]}")
+
+    mcp = FastMCP("demo")
+    try:
+        real_app = mcp.streamable_http_app()
+        print(f"App returned: {type(real_app)}")
+        for r in getattr(real_app, 'routes', []):
+            print(f"Route: {r.path} [{type(r)}]")
+    except Exception as e:
+        print(f"Error calling app factory: {e}")
+
+
+def check_middleware():
+    """Walk the wrapped ASGI app chain of src.server_http.app."""
+    from starlette.middleware.trustedhost import TrustedHostMiddleware
+
+    app = load_server_http().app
+    has_trusted = False
+
+    print("Middleware Stack:")
+    while app is not None:
+        name = getattr(app, '__name__', type(app).__name__)
+        print(f"- {name}")
+        has_trusted = has_trusted or isinstance(app, TrustedHostMiddleware)
+        app = getattr(app, 'app', None)
+
+    print(f"Has TrustedHostMiddleware: {has_trusted}")
+
+
+async def call_asgi(app, method, path, headers, timeout=10.0):
+    """Drive one HTTP request through an ASGI app; return (status, body).
+
+    The request body is empty. Once the response is complete (or the timeout
+    expires for streaming endpoints) the app sees an http.disconnect.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        "client": ("127.0.0.1", 50000),
+        "server": (headers.get("Host", "localhost"), 80),
+    }
+    messages = []
+    request_sent = False
+    response_done = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+        if message["type"] == "http.response.body" and not message.get("more_body", False):
+            response_done.set()
+
+    try:
+        await asyncio.wait_for(app(scope, receive, send), timeout)
+    except asyncio.TimeoutError:
+        print(f"(no complete response after {timeout:g}s; showing what was sent)")
+
+    status = next((m["status"] for m in messages if m["type"] == "http.response.start"), None)
+    body = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+    return status, body
+
+
+def check_reproduce():
+    """Send GET /mcp with the Azure Host header through the full app."""
+    server_http = load_server_http()
+
+    async def probe():
+        # The MCP handler needs the session manager's task group, which the
+        # server normally starts in its lifespan
+        async with server_http.mcp.session_manager.run():
+            return await call_asgi(server_http.app, "GET", "/mcp", {"Host": AZURE_HOST})
+
+    print("Sending request with Azure Host header...")
+    status, body = asyncio.run(probe())
+
+    print(f"Status Code: {status}")
+    print(f"Content: {body.decode('utf-8', 'replace')}")
+
+
+def check_verify():
+    """Confirm the server module and its skill modules import cleanly."""
+    print("Testing imports...")
+    try:
+        from src import server
+        print("Successfully imported server module.")
+    except Exception as e:
+        print(f"FAILED to import server module: {e}")
+        return
+
+    if not hasattr(server, 'mcp'):
+        print("MCP object NOT found in server module.")
+    else:
+        print("MCP object found.")
+        for tool in ('audit_daily_checks', 'validate_screenshots'):
+            found = "found" if hasattr(server, tool) else "NOT found"
+            print(f"{tool} function {found}.")
+
+    # Check if the inner logic modules were loaded
+    if server.DailyChecksAuditor:
+        print("DailyChecksAuditor loaded successfully.")
+    else:
+        print("DailyChecksAuditor FAILED to load (ImportError in server.py).")
+
+
+CHECKS = {
+    'routes': check_routes,
+    'middleware': check_middleware,
+    'reproduce': check_reproduce,
+    'verify': check_verify,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP server diagnostics")
+    parser.add_argument('checks', nargs='+', choices=list(CHECKS),
+                        help="Checks to run, in order, in one interpreter")
+    args = parser.parse_args()
+
+    failed = []
+    for name in args.checks:
+        print(f"=== {name} ===")
+        # Keep going so one broken check does not hide the others' output
+        try:
+            CHECKS[name]()
+        except Exception as e:
+            print(f"Check '{name}' FAILED: {type(e).__name__}: {e}")
+            failed.append(name)
+
+    if failed:
+        print(f"Failed checks: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()